@@ -0,0 +1,28 @@
+"""
+Gunicorn configuration for the Insight REST API
+
+Production entrypoint:
+    gunicorn insight_api:app
+
+Each worker process holds its own in-memory InsightFramework, so an anchor
+created on one worker would be unknown to the others. The API therefore runs
+as a single Uvicorn worker until framework state lives in a shared store;
+Gunicorn still provides process supervision and graceful restarts.
+"""
+
+import os
+
+bind = os.getenv("INSIGHT_API_BIND", "0.0.0.0:8000")
+worker_class = "uvicorn_worker.UvicornWorker"
+workers = 1
+worker_connections = 1000
+keepalive = 5
+loglevel = os.getenv("INSIGHT_API_LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    """Refuse to start more than one worker (e.g. via -w on the command line)"""
+    if server.cfg.workers > 1:
+        raise RuntimeError(
+            "Insight API framework state is per-process; run with a single worker"
+        )
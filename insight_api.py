@@ -3,17 +3,26 @@ Insight REST API Server
 
 FastAPI-based REST API for the Cognitive Insight AI Framework.
 Provides HTTP endpoints for all Insight operations.
+
+Run `python insight_api.py` for a single auto-reloading development server,
+or `gunicorn insight_api:app` (see gunicorn.conf.py) in production.
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Security, status
+from fastapi import FastAPI, HTTPException, Depends, Request, Security, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from typing import Dict, List, Optional, Any
 import uvicorn
 from datetime import datetime
 import logging
 import os
+import asyncio
+import threading
+import orjson
 from contextlib import asynccontextmanager
 
 # Import Insight modules
@@ -32,12 +41,15 @@ from models.insight import (
 )
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("INSIGHT_LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 # Security
 security = HTTPBearer()
 
+# The framework is not thread-safe; its calls run in worker threads one at a time
+_framework_lock = threading.Lock()
+
 # Global CIAF framework instance
 insight_framework: Optional[InsightFramework] = None
 
@@ -67,6 +79,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses (audit trails, dataset and capsule lists)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Pydantic models for request/response
 class DatasetMetadata(BaseModel):
     source: str
@@ -95,6 +110,27 @@ class CreateProvenanceCapsuleRequest(BaseModel):
     dataset_id: str
     data_items: List[DataItem]
 
+# Validates capsule batches straight from the raw JSON body, skipping the
+# intermediate dict FastAPI would otherwise build for large item lists
+CAPSULE_REQUEST_ADAPTER = TypeAdapter(CreateProvenanceCapsuleRequest)
+
+def inline_json_schema(adapter: TypeAdapter) -> Dict[str, Any]:
+    """JSON schema with local $defs inlined, for use in openapi_extra"""
+    schema = adapter.json_schema()
+    defs = schema.pop("$defs", {})
+    
+    def resolve(node):
+        if isinstance(node, dict):
+            ref = node.get("$ref", "")
+            if ref.startswith("#/$defs/"):
+                return resolve(defs[ref[len("#/$defs/"):]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+    
+    return resolve(schema)
+
 class ProvenanceCapsuleResponse(BaseModel):
     success: bool
     capsules_created: int
@@ -134,6 +170,11 @@ class AuditResponse(BaseModel):
     audit_records: List[Dict[str, Any]]
     total_records: int
 
+class DatasetListResponse(BaseModel):
+    success: bool
+    datasets: List[Dict[str, Any]]
+    count: int
+
 # Authentication function
 async def verify_token(credentials: HTTPAuthorizationCredentials = Security(security)):
     """Verify API token - implement your authentication logic here"""
@@ -149,10 +190,27 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Security(secu
         )
     return token
 
-# Health check endpoint
+def _call_locked(func, *args, **kwargs):
+    with _framework_lock:
+        return func(*args, **kwargs)
+
+async def call_framework(func, *args, **kwargs):
+    """Run a synchronous framework call in a worker thread, off the event loop"""
+    return await asyncio.to_thread(_call_locked, func, *args, **kwargs)
+
+# Health check endpoints
+# Liveness probes hit /health often, so its body is serialized once up front.
+# A fresh Response is still built per call: middleware mutates response headers.
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "version": "1.0.0"})
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+@app.get("/health/detail")
+async def health_detail():
+    """Health check with server timestamp"""
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
@@ -167,11 +225,13 @@ async def create_dataset_anchor(
 ):
     """Create a new cryptographically secured dataset anchor"""
     try:
-        logger.info(f"Creating dataset anchor: {request.dataset_id}")
+        logger.info("Creating dataset anchor: %s", request.dataset_id)
+        metadata = request.metadata.model_dump()
         
-        anchor = insight_framework.create_dataset_anchor(
+        anchor = await call_framework(
+            insight_framework.create_dataset_anchor,
             dataset_id=request.dataset_id,
-            dataset_metadata=request.metadata.dict(),
+            dataset_metadata=metadata,
             master_password=request.master_password
         )
         
@@ -181,13 +241,13 @@ async def create_dataset_anchor(
                 "dataset_id": anchor.dataset_id,
                 "dataset_fingerprint": anchor.dataset_fingerprint,
                 "created_at": datetime.utcnow().isoformat(),
-                "metadata": request.metadata.dict()
+                "metadata": metadata
             },
             message=f"Dataset anchor created successfully for {request.dataset_id}"
         )
         
     except Exception as e:
-        logger.error(f"Error creating dataset anchor: {str(e)}")
+        logger.error("Error creating dataset anchor: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/dataset-anchor/{dataset_id}")
@@ -215,18 +275,41 @@ async def get_dataset_anchor(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving dataset anchor: {str(e)}")
+        logger.error("Error retrieving dataset anchor: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Provenance Capsule endpoints
-@app.post("/api/provenance/create-capsules", response_model=ProvenanceCapsuleResponse)
+@app.post(
+    "/api/provenance/create-capsules",
+    response_model=ProvenanceCapsuleResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": inline_json_schema(CAPSULE_REQUEST_ADAPTER)}}
+        }
+    }
+)
 async def create_provenance_capsules(
-    request: CreateProvenanceCapsuleRequest,
+    http_request: Request,
     token: str = Depends(verify_token)
 ):
     """Generate provenance capsules for dataset items"""
+    body = await http_request.body()
+    if not body:
+        # Same error FastAPI reports for a missing required body
+        raise RequestValidationError([
+            {"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}
+        ])
+    try:
+        request = CAPSULE_REQUEST_ADAPTER.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ])
+    
     try:
-        logger.info(f"Creating provenance capsules for dataset: {request.dataset_id}")
+        logger.info("Creating provenance capsules for dataset: %s", request.dataset_id)
         
         # Convert DataItem objects to dictionaries
         data_items = []
@@ -236,11 +319,13 @@ async def create_provenance_capsules(
                 "metadata": {**item.metadata, "id": item.id}
             })
         
-        capsules = insight_framework.create_provenance_capsules(
+        capsules = await call_framework(
+            insight_framework.create_provenance_capsules,
             dataset_id=request.dataset_id,
             data_items=data_items
         )
         
+        created_at = datetime.utcnow().isoformat()
         capsule_data = []
         for capsule in capsules:
             capsule_data.append({
@@ -248,7 +333,7 @@ async def create_provenance_capsules(
                 "item_id": capsule.original_item_id,
                 "hash": capsule.capsule_hash,
                 "encrypted": True,
-                "created_at": datetime.utcnow().isoformat()
+                "created_at": created_at
             })
         
         return ProvenanceCapsuleResponse(
@@ -258,7 +343,7 @@ async def create_provenance_capsules(
         )
         
     except Exception as e:
-        logger.error(f"Error creating provenance capsules: {str(e)}")
+        logger.error("Error creating provenance capsules: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Model Training endpoints
@@ -269,10 +354,11 @@ async def train_model(
 ):
     """Train model with CIAF provenance tracking"""
     try:
-        logger.info(f"Training model: {request.model_name} v{request.model_version}")
+        logger.info("Training model: %s v%s", request.model_name, request.model_version)
         
         # Create Model Aggregation Key
-        mak = insight_framework.create_model_aggregation_key(
+        mak = await call_framework(
+            insight_framework.create_model_aggregation_key,
             model_name=request.model_name,
             authorized_datasets=request.authorized_datasets
         )
@@ -282,7 +368,8 @@ async def train_model(
         capsules = []
         
         # Train model
-        snapshot = insight_framework.train_model(
+        snapshot = await call_framework(
+            insight_framework.train_model,
             model_name=request.model_name,
             capsules=capsules,
             mak=mak,
@@ -302,7 +389,7 @@ async def train_model(
         )
         
     except Exception as e:
-        logger.error(f"Error training model: {str(e)}")
+        logger.error("Error training model: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Inference endpoints
@@ -313,7 +400,7 @@ async def create_inference_receipt(
 ):
     """Generate uncertainty receipt for model inference"""
     try:
-        logger.info(f"Creating inference receipt for model: {request.model_name}")
+        logger.info("Creating inference receipt for model: %s", request.model_name)
         
         # Create inference receipt (simplified for demo)
         from models.insight.inference import InferenceReceipt
@@ -338,7 +425,7 @@ async def create_inference_receipt(
         )
         
     except Exception as e:
-        logger.error(f"Error creating inference receipt: {str(e)}")
+        logger.error("Error creating inference receipt: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Audit endpoints
@@ -349,18 +436,18 @@ async def query_audit_trail(
 ):
     """Query audit trail for a model"""
     try:
-        logger.info(f"Querying audit trail for model: {request.model_name}")
+        logger.info("Querying audit trail for model: %s", request.model_name)
         
-        # Create audit trail generator
+        # Create audit trail generator; a fresh one per query, so the trail
+        # always reflects the latest writes for the model
         audit_gen = AuditTrailGenerator(request.model_name)
         
         # Get audit records
         records = audit_gen.get_audit_trail()
         
         # Convert records to dictionaries
-        audit_data = []
-        for record in records:
-            audit_data.append({
+        audit_data = [
+            {
                 "event_id": record.event_id,
                 "event_type": record.event_type.value,
                 "timestamp": record.timestamp,
@@ -369,7 +456,9 @@ async def query_audit_trail(
                 "user_id": record.user_id,
                 "compliance_status": record.compliance_status,
                 "risk_level": record.risk_level
-            })
+            }
+            for record in records
+        ]
         
         return AuditResponse(
             success=True,
@@ -378,7 +467,7 @@ async def query_audit_trail(
         )
         
     except Exception as e:
-        logger.error(f"Error querying audit trail: {str(e)}")
+        logger.error("Error querying audit trail: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Utility endpoints
@@ -393,15 +482,16 @@ async def list_models(token: str = Depends(verify_token)):
             "count": len(models)
         }
     except Exception as e:
-        logger.error(f"Error listing models: {str(e)}")
+        logger.error("Error listing models: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/datasets")
+@app.get("/api/datasets", response_model=DatasetListResponse)
 async def list_datasets(token: str = Depends(verify_token)):
     """List all dataset anchors"""
     try:
         datasets = []
-        for dataset_id, anchor in insight_framework.dataset_anchors.items():
+        # Snapshot first: a worker thread may be adding anchors meanwhile
+        for dataset_id, anchor in list(insight_framework.dataset_anchors.items()):
             datasets.append({
                 "dataset_id": dataset_id,
                 "fingerprint": anchor.dataset_fingerprint,
@@ -414,7 +504,7 @@ async def list_datasets(token: str = Depends(verify_token)):
             "count": len(datasets)
         }
     except Exception as e:
-        logger.error(f"Error listing datasets: {str(e)}")
+        logger.error("Error listing datasets: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/performance/{dataset_id}")
@@ -424,13 +514,13 @@ async def get_performance_metrics(
 ):
     """Get performance metrics for a dataset"""
     try:
-        metrics = insight_framework.get_performance_metrics(dataset_id)
+        metrics = await call_framework(insight_framework.get_performance_metrics, dataset_id)
         return {
             "success": True,
             "metrics": metrics
         }
     except Exception as e:
-        logger.error(f"Error getting performance metrics: {str(e)}")
+        logger.error("Error getting performance metrics: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
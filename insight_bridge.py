@@ -17,6 +17,13 @@ current_dir = Path(__file__).parent
 models_dir = current_dir / "models"
 sys.path.insert(0, str(models_dir))
 
+# Configure logging (stderr; stdout is reserved for JSON responses)
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
 try:
     from insight.api.framework_new import InsightFramework
     from insight.anchoring.dataset_anchor import DatasetAnchor
@@ -25,17 +32,10 @@ try:
     from insight.compliance.validators import ComplianceValidator
     from insight.compliance.reports import ReportGenerator
 except ImportError as e:
-    print(f"Error importing Insight modules: {e}")
-    print("Make sure the Insight framework is properly installed")
+    logger.error("Error importing Insight modules: %s", e)
+    logger.error("Make sure the Insight framework is properly installed")
     sys.exit(1)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
 class InsightBridgeService:
     """Bridge service for connecting Insight framework to Next.js frontend"""
     
@@ -71,19 +71,38 @@ class InsightBridgeService:
             }
     
     async def create_provenance_capsules(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create provenance capsules for data items"""
+        """Create provenance capsules for data items
+        
+        Items are processed independently, so one failing item does not stop
+        the others. If any item fails the response is unsuccessful, but it
+        still returns the created capsules and lists the failures in
+        'failed_items', so a retry only needs to resend those items.
+        """
         try:
             dataset_id = data.get('dataset_id')
             data_items = data.get('data_items', [])
             
-            capsules = []
-            for item in data_items:
-                capsule = await self.framework.create_provenance_capsule(
+            # Items are independent, so create their capsules concurrently
+            results = await asyncio.gather(*(
+                self.framework.create_provenance_capsule(
                     dataset_id=dataset_id,
                     item_id=item.get('id'),
                     content=item.get('content'),
                     metadata=item.get('metadata', {})
                 )
+                for item in data_items
+            ), return_exceptions=True)
+            
+            capsules = []
+            failed_items = []
+            for item, capsule in zip(data_items, results):
+                if isinstance(capsule, Exception):
+                    self.logger.error(f"Error creating provenance capsule for item {item.get('id')}: {capsule}")
+                    failed_items.append({
+                        'item_id': item.get('id'),
+                        'error': str(capsule)
+                    })
+                    continue
                 
                 capsules.append({
                     'capsule_id': capsule.capsule_id,
@@ -93,6 +112,15 @@ class InsightBridgeService:
                     'created_at': capsule.created_at.isoformat()
                 })
             
+            if failed_items:
+                return {
+                    'success': False,
+                    'error': failed_items[0]['error'],
+                    'capsules_created': len(capsules),
+                    'capsules': capsules,
+                    'failed_items': failed_items
+                }
+            
             return {
                 'success': True,
                 'capsules_created': len(capsules),
@@ -215,6 +243,16 @@ class InsightBridgeService:
                 'error': str(e)
             }
 
+# Shared bridge service, created on first request and reused for the session
+_bridge: Optional[InsightBridgeService] = None
+
+def get_bridge() -> InsightBridgeService:
+    """Return the shared bridge service, creating it on first use"""
+    global _bridge
+    if _bridge is None:
+        _bridge = InsightBridgeService()
+    return _bridge
+
 async def handle_request(request_data: str) -> str:
     """Handle a single request from the frontend"""
     try:
@@ -222,7 +260,7 @@ async def handle_request(request_data: str) -> str:
         operation = data.get('operation')
         params = data.get('params', {})
         
-        bridge = InsightBridgeService()
+        bridge = get_bridge()
         
         if operation == 'create_dataset_anchor':
             result = await bridge.create_dataset_anchor(params)
@@ -253,11 +291,14 @@ async def main():
     """Main function for running the bridge service"""
     logger.info("Starting Insight Bridge Service")
     
-    # Read from stdin and write to stdout for communication with Node.js
+    # Read from stdin and write to stdout for communication with Node.js.
+    # Requests are handled one at a time, in arrival order: a request may
+    # depend on an earlier one (e.g. capsules for a just-created anchor), and
+    # the Node.js side matches responses to requests in FIFO order
     while True:
         try:
-            # Read request from stdin
-            line = input()
+            # Read request from stdin without blocking the event loop
+            line = (await asyncio.to_thread(sys.stdin.readline)).rstrip('\n')
             if not line:
                 break
                 
@@ -268,9 +309,6 @@ async def main():
             print(result)
             sys.stdout.flush()
             
-        except EOFError:
-            # End of input
-            break
         except Exception as e:
             logger.error(f"Error in main loop: {e}")
             error_response = json.dumps({